@@ -1,6 +1,12 @@
 import atexit
 import logging
+import tracemalloc
 from django.apps import AppConfig
+from django.conf import settings
+
+from .gc_monitor import gc_monitor
+from .request_stats import request_stats
+from .watchdog import watchdog
 
 
 class DjangoAppConfig(AppConfig):
@@ -15,6 +21,29 @@ class DjangoAppConfig(AppConfig):
         # Log server start
         logger.info("Server started successfully")
 
+        # Start the slow-request watchdog
+        if settings.SLOW_REQUEST_WATCHDOG_ENABLED:
+            watchdog.configure(
+                threshold=settings.SLOW_REQUEST_THRESHOLD,
+                interval=settings.SLOW_REQUEST_WATCHDOG_INTERVAL,
+            )
+            watchdog.start()
+
+        # Record GC pauses
+        if settings.GC_MONITOR_ENABLED:
+            gc_monitor.install()
+
+        # Trace allocations for the per-request figures
+        if settings.TRACEMALLOC_REQUESTS_ENABLED:
+            tracemalloc.start()
+
+        # Size the live request statistics
+        request_stats.configure(
+            recent_size=settings.REQUEST_STATS_RECENT_SIZE,
+            top_k=settings.REQUEST_STATS_TOP_K,
+            window=settings.REQUEST_STATS_WINDOW,
+        )
+
         # Register shutdown handler
         atexit.register(self._log_shutdown)
 
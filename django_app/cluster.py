@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+# Upper bound on a peer response, headers included
+MAX_RESPONSE_BYTES = 1024 * 1024
+
+
+async def fetch_json(url, timeout, max_bytes=MAX_RESPONSE_BYTES):
+    """GET ``url`` over a plain asyncio connection and decode the JSON body.
+
+    Raises ValueError if the response is larger than ``max_bytes``.
+    """
+    parts = urlsplit(url)
+    use_ssl = parts.scheme == 'https'
+    port = parts.port or (443 if use_ssl else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+
+    async def request():
+        reader, writer = await asyncio.open_connection(parts.hostname, port, ssl=use_ssl or None)
+        try:
+            writer.write(
+                f"GET {path} HTTP/1.0\r\n"
+                f"Host: {parts.netloc}\r\n"
+                "Accept: application/json\r\n"
+                "Connection: close\r\n\r\n".encode('ascii')
+            )
+            await writer.drain()
+            raw = bytearray()
+            while chunk := await reader.read(64 * 1024):
+                raw += chunk
+                if len(raw) > max_bytes:
+                    raise ValueError(f"response larger than {max_bytes} bytes")
+        finally:
+            writer.close()
+
+        head, _, body = raw.partition(b'\r\n\r\n')
+        status_line = head.split(b'\r\n', 1)[0].split()
+        if len(status_line) < 2 or not status_line[1].isdigit():
+            raise ValueError("malformed HTTP response")
+        status_code = int(status_line[1])
+        if status_code != 200:
+            raise ValueError(f"HTTP {status_code}")
+        return json.loads(body)
+
+    return await asyncio.wait_for(request(), timeout)
+
+
+class ClusterStatusAggregator:
+    """Collects status data from the peers listed in ``settings.CLUSTER_PEERS``.
+
+    Peers are queried concurrently, each under its own timeout. Results are
+    cached for ``settings.CLUSTER_STATUS_TTL`` seconds; stale results are
+    served while a background thread refreshes them, so a slow peer only
+    delays the very first aggregate.
+    """
+
+    STATUS_PATH = '/status.json'
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def clear(self):
+        """Forget all cached peer results."""
+        self._cache.clear()
+
+    async def refresh(self, peers, timeout):
+        """Query ``peers`` concurrently and update the cache."""
+        results = await asyncio.gather(*(self._fetch_peer(peer, timeout) for peer in peers))
+        for peer, result in zip(peers, results):
+            self._cache[peer] = result
+
+    async def _fetch_peer(self, peer, timeout):
+        result = {'peer': peer, 'checked': time.monotonic()}
+        try:
+            status = await fetch_json(peer.rstrip('/') + self.STATUS_PATH, timeout)
+            if not isinstance(status, dict):
+                raise ValueError("status is not a JSON object")
+            result.update(ok=True, status=status)
+        except asyncio.TimeoutError:
+            result.update(ok=False, error=f"timed out after {timeout}s")
+        except (OSError, ValueError) as exc:
+            result.update(ok=False, error=str(exc) or exc.__class__.__name__)
+        return result
+
+    def collect(self):
+        """Return the merged cluster status, refreshing stale peers as needed."""
+        peers = list(settings.CLUSTER_PEERS)
+        timeout = settings.CLUSTER_PEER_TIMEOUT
+
+        # Peers never seen before have nothing to serve yet, so wait for them
+        missing = [peer for peer in peers if peer not in self._cache]
+        if missing:
+            asyncio.run(self.refresh(missing, timeout))
+
+        now = time.monotonic()
+        results = [self._cache[peer] for peer in peers]
+        if any(now - result['checked'] > settings.CLUSTER_STATUS_TTL for result in results):
+            self._refresh_in_background(peers, timeout)
+
+        return self._merge(results, now)
+
+    def _refresh_in_background(self, peers, timeout):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                asyncio.run(self.refresh(peers, timeout))
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name='cluster-status-refresh', daemon=True).start()
+
+    @staticmethod
+    def _merge(results, now):
+        nodes = []
+        for result in results:
+            node = {key: value for key, value in result.items() if key != 'checked'}
+            node['age'] = round(now - result['checked'], 2)  # in seconds
+            nodes.append(node)
+
+        healthy = [node['status'] for node in nodes if node['ok']]
+        summary = {'nodes': len(nodes), 'healthy': len(healthy)}
+        for key in ('cpu_usage', 'memory_usage'):
+            values = [status[key] for status in healthy if isinstance(status.get(key), (int, float))]
+            summary[key] = round(sum(values) / len(values), 1) if values else None
+        return {'summary': summary, 'nodes': nodes}
+
+
+# Shared instance used by the cluster status view
+cluster_status_aggregator = ClusterStatusAggregator()
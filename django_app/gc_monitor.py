@@ -0,0 +1,144 @@
+import bisect
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+
+
+class _RequestGCStats:
+    """GC activity observed while a single request was in flight."""
+
+    __slots__ = ('pause', 'collections')
+
+    def __init__(self):
+        self.pause = 0.0
+        self.collections = 0
+
+
+class GCMonitor:
+    """Records garbage collection pauses and attributes them to in-flight requests.
+
+    Pause durations are bucketed into per-generation histograms. Each pause is
+    also added to every request registered at the time, because a collection
+    holds the GIL and stalls all request threads alike.
+    """
+
+    # Upper bounds of the histogram buckets, in milliseconds; the last bucket is open-ended
+    BUCKETS = (0.1, 0.5, 1, 5, 10, 50, 100, 500)
+
+    def __init__(self):
+        self._in_flight = {}
+        self._collection_start = None
+        self._installed = False
+        self.reset()
+
+    @property
+    def installed(self):
+        return self._installed
+
+    def install(self):
+        """Register the monitor in gc.callbacks."""
+        if not self._installed:
+            gc.callbacks.append(self._callback)
+            self._installed = True
+
+    def uninstall(self):
+        """Remove the monitor from gc.callbacks and forget in-flight requests."""
+        if self._installed:
+            gc.callbacks.remove(self._callback)
+            self._installed = False
+        self._in_flight.clear()
+
+    def reset(self):
+        """Clear all recorded histograms."""
+        self._counts = {generation: [0] * (len(self.BUCKETS) + 1) for generation in range(3)}
+        self._totals = {generation: 0.0 for generation in range(3)}
+
+    def histograms(self):
+        """Return per-generation pause histograms as plain, JSON-serializable data."""
+        labels = [f"<={bound}" for bound in self.BUCKETS] + [f">{self.BUCKETS[-1]}"]
+        return {
+            str(generation): {
+                'collections': sum(counts),
+                'total_pause': round(self._totals[generation], 3),  # in milliseconds
+                'buckets': dict(zip(labels, counts)),
+            }
+            for generation, counts in self._counts.items()
+        }
+
+    def request_started(self, request):
+        """Start attributing GC pauses to the current thread's request."""
+        if self._installed:
+            self._in_flight[threading.get_ident()] = _RequestGCStats()
+
+    def request_finished(self, request):
+        """Stop attributing pauses; return the request's stats or None if untracked."""
+        return self._in_flight.pop(threading.get_ident(), None)
+
+    def record_pause(self, generation, duration):
+        """Add a pause of ``duration`` milliseconds for ``generation``."""
+        self._counts[generation][bisect.bisect_left(self.BUCKETS, duration)] += 1
+        self._totals[generation] += duration
+        for stats in self._in_flight.copy().values():
+            stats.pause += duration
+            stats.collections += 1
+
+    def _callback(self, phase, info):
+        if phase == 'start':
+            self._collection_start = time.perf_counter()
+        elif self._collection_start is not None:
+            duration = (time.perf_counter() - self._collection_start) * 1000
+            self._collection_start = None
+            self.record_pause(info['generation'], duration)
+
+
+class AllocationTracker:
+    """Measures allocations between ``start()`` and ``stop()``.
+
+    Bytes come from the ``tracemalloc.get_traced_memory()`` delta and blocks
+    from the ``sys.getallocatedblocks()`` delta, so both readings are cheap.
+    Both are process-wide: with concurrent requests the figures include
+    allocations made by other threads in the same window, and the peak is the
+    process-wide peak since the most recent ``start()`` in any thread.
+    """
+
+    def __init__(self):
+        self._start_memory = 0
+        self._start_blocks = 0
+        self.peak_bytes = 0
+        self.retained_bytes = 0
+        self.retained_blocks = 0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._start_memory = tracemalloc.get_traced_memory()[0]
+        self._start_blocks = sys.getallocatedblocks()
+        return self
+
+    def stop(self):
+        blocks = sys.getallocatedblocks()
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak_bytes = max(peak - self._start_memory, 0)
+        self.retained_bytes = current - self._start_memory
+        self.retained_blocks = blocks - self._start_blocks
+        return self
+
+    def as_dict(self):
+        return {
+            'peak_bytes': self.peak_bytes,
+            'retained_bytes': self.retained_bytes,
+            'retained_blocks': self.retained_blocks,
+        }
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+# Shared instance used by RequestLoggingMiddleware and installed in AppConfig.ready()
+gc_monitor = GCMonitor()
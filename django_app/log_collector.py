@@ -0,0 +1,135 @@
+"""Minimal stand-in collector for records shipped by SocketBatchHandler.
+
+Run it next to the app to receive the request log and report throughput:
+
+    python -m django_app.log_collector unix_dgram /tmp/django_app_logs.sock
+"""
+import argparse
+import os
+import socket
+import threading
+import time
+
+from .log_shipping import SocketBatchHandler, parse_address
+
+
+class LogCollector:
+    """Receives newline-delimited records over a Unix datagram or stream socket, or UDP."""
+
+    def __init__(self, transport, address, keep_records=True):
+        if transport not in SocketBatchHandler.TRANSPORTS:
+            raise ValueError(f"Unknown transport {transport!r}")
+        self.transport = transport
+        self.address = parse_address(transport, address)
+        self.keep_records = keep_records
+        self.records = []
+        self.count = 0
+        self._condition = threading.Condition()
+        self._sock = None
+        self._threads = []
+        self._running = False
+
+    def start(self):
+        """Bind the socket and start receiving in background threads."""
+        family, sock_type = SocketBatchHandler.TRANSPORTS[self.transport]
+        if family == socket.AF_UNIX and os.path.exists(self.address):
+            os.remove(self.address)
+        self._sock = socket.socket(family, sock_type)
+        self._sock.bind(self.address)
+        if self.transport == 'udp':
+            self.address = self._sock.getsockname()
+        self._sock.settimeout(0.2)
+        self._running = True
+        if sock_type == socket.SOCK_STREAM:
+            self._sock.listen()
+            self._spawn(self._accept)
+        else:
+            self._spawn(self._receive_datagrams)
+        return self
+
+    def stop(self):
+        """Stop receiving and remove the Unix socket file."""
+        self._running = False
+        for thread in self._threads:
+            thread.join()
+        self._sock.close()
+        if self.transport != 'udp' and os.path.exists(self.address):
+            os.remove(self.address)
+
+    def wait_for(self, count, timeout):
+        """Wait until at least ``count`` records arrived; return whether they did."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.count >= count, timeout)
+
+    def _spawn(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _add(self, lines):
+        with self._condition:
+            self.count += len(lines)
+            if self.keep_records:
+                self.records.extend(lines)
+            self._condition.notify_all()
+
+    def _receive_datagrams(self):
+        while self._running:
+            try:
+                data = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self._add(data.decode('utf-8').split('\n'))
+
+    def _accept(self):
+        while self._running:
+            try:
+                connection, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            connection.settimeout(0.2)
+            self._spawn(self._receive_stream, connection)
+
+    def _receive_stream(self, connection):
+        pending = b''
+        with connection:
+            while self._running:
+                try:
+                    data = connection.recv(65536)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                if not data:
+                    break
+                *lines, pending = (pending + data).split(b'\n')
+                if lines:
+                    self._add([line.decode('utf-8') for line in lines])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('transport', choices=sorted(SocketBatchHandler.TRANSPORTS))
+    parser.add_argument('address', help="socket path, or host:port for udp")
+    args = parser.parse_args()
+
+    collector = LogCollector(args.transport, args.address, keep_records=False).start()
+    print(f"Listening on {collector.address} ({args.transport})")
+    try:
+        previous = 0
+        while True:
+            time.sleep(1)
+            print(f"{collector.count - previous} records/s, {collector.count} total")
+            previous = collector.count
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.stop()
+
+
+if __name__ == '__main__':
+    main()
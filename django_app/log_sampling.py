@@ -0,0 +1,68 @@
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+
+
+class LogSampler:
+    """Tail-based sampling policy for the request log.
+
+    The decision is made once the response is known: errors and slow
+    requests are always kept, other requests are kept with the route's keep
+    rate. Kept records carry a sample weight of ``1 / rate`` so that request
+    counts can be reconstructed by summing weights.
+    """
+
+    def __init__(self, keep_rate=1.0, slow_threshold=500.0, route_rates=None, rng=random.random):
+        self.keep_rate = keep_rate
+        self.slow_threshold = slow_threshold  # in milliseconds
+        self.route_rates = dict(route_rates or {})
+        self.rng = rng
+
+    def sample_weight(self, route, status_code, duration):
+        """Return the record's sample weight, or None if it should be dropped."""
+        if status_code >= 400 or duration >= self.slow_threshold:
+            return 1.0
+        rate = self.route_rates.get(route, self.keep_rate)
+        if rate >= 1:
+            return 1.0
+        if rate <= 0 or self.rng() >= rate:
+            return None
+        return 1 / rate
+
+
+class ErrorBodyDeduplicator:
+    """Truncates error response bodies and logs each distinct body only once.
+
+    Bodies are identified by a hash of the full content. The hashes of the
+    most recently seen ``max_entries`` bodies are remembered; a repeated body
+    is logged by hash alone.
+    """
+
+    def __init__(self, max_bytes=4096, max_entries=1024):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fields(self, content):
+        """Return the log fields describing the error body ``content``."""
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        fields = {"response_body_hash": digest}
+
+        with self._lock:
+            duplicate = digest in self._seen
+            if duplicate:
+                self._seen.move_to_end(digest)
+            else:
+                self._seen[digest] = None
+                if len(self._seen) > self.max_entries:
+                    self._seen.popitem(last=False)
+
+        if duplicate:
+            fields["response_body_duplicate"] = True
+        else:
+            fields["response_body"] = content[:self.max_bytes].decode('utf-8', errors='ignore')
+            if len(content) > self.max_bytes:
+                fields["response_body_truncated"] = True
+        return fields
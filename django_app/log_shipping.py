@@ -0,0 +1,284 @@
+import fcntl
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def parse_address(transport, address):
+    """Turn ``address`` into a socket address: a path for Unix sockets, (host, port) for UDP."""
+    if transport != 'udp':
+        return address
+    if isinstance(address, str):
+        host, _, port = address.rpartition(':')
+        return host, int(port)
+    host, port = address
+    return host, int(port)
+
+
+class SocketBatchHandler(logging.Handler):
+    """Logging handler that ships records in batches to a local collector.
+
+    ``emit`` only serializes the record into a bounded in-memory buffer; when
+    the buffer is full the oldest records are dropped. A background thread
+    sends the buffer in batches over a Unix datagram or stream socket, or UDP,
+    as newline-delimited records. If the collector is unreachable, batches are
+    appended to ``spill_file`` and reconnects are retried with exponential
+    backoff; the spill file is replayed once the collector is back, so
+    delivery is at least once. Over UDP an absent collector is only noticed
+    on a later send, so some records may be lost. A collector that stops
+    reading counts as unreachable after ``send_timeout`` seconds.
+
+    Processes sharing ``spill_file`` take an exclusive ``flock`` on
+    ``spill_file + '.lock'`` around each append and replay, so a worker
+    replaying or truncating the file never loses or duplicates lines
+    another worker spilled.
+
+    The sender thread is started by the first ``emit`` in each process, so
+    workers forked from a preloading server (e.g. gunicorn ``--preload``)
+    get their own thread and socket instead of the parent's.
+    """
+
+    TRANSPORTS = {
+        'unix_dgram': (socket.AF_UNIX, socket.SOCK_DGRAM),
+        'unix_stream': (socket.AF_UNIX, socket.SOCK_STREAM),
+        'udp': (socket.AF_INET, socket.SOCK_DGRAM),
+    }
+
+    def __init__(self, address, transport='unix_dgram', record_format='compact', batch_size=100,
+                 flush_interval=1.0, buffer_size=10000, max_datagram_size=60000,
+                 spill_file='log_spill.jsonl', spill_max_bytes=100 * 1024 * 1024,
+                 backoff_initial=0.5, backoff_max=30.0, send_timeout=5.0, close_timeout=10.0,
+                 level=logging.NOTSET):
+        if transport not in self.TRANSPORTS:
+            raise ValueError(f"Unknown transport {transport!r}, expected one of {sorted(self.TRANSPORTS)}")
+        if record_format not in ('compact', 'json'):
+            raise ValueError(f"Unknown record format {record_format!r}, expected 'compact' or 'json'")
+        super().__init__(level)
+        self.transport = transport
+        self.address = parse_address(transport, address)
+        self.record_format = record_format
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_datagram_size = max_datagram_size
+        self.spill_file = spill_file
+        self.spill_max_bytes = spill_max_bytes
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.send_timeout = send_timeout
+        self.close_timeout = close_timeout
+        self.dropped = 0
+
+        self._buffer = deque(maxlen=buffer_size)
+        self._sock = None
+        self._backoff = backoff_initial
+        self._next_attempt = 0.0
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._sender_pid = None
+
+    def serialize(self, record):
+        """Render ``record`` as a single line."""
+        message = self.format(record)
+        if self.record_format == 'json':
+            return json.dumps({
+                "time": record.created,
+                "level": record.levelname,
+                "logger": record.name,
+                "message": message,
+            })
+        return message.replace('\n', '\\n')
+
+    def emit(self, record):
+        try:
+            line = self.serialize(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self._ensure_sender()
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(line)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_sender(self):
+        # Called from emit, which runs under the handler lock
+        pid = os.getpid()
+        if self._sender_pid == pid:
+            return
+        if self._sender_pid is not None:
+            # Forked child: the parent's thread is gone, and its socket and
+            # pending records belong to the parent
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+            self._buffer.clear()
+            self._wakeup = threading.Event()
+            self._stop = threading.Event()
+        self._sender_pid = pid
+        self._thread = threading.Thread(target=self._run, name='log-shipping', daemon=True)
+        self._thread.start()
+
+    def flush(self):
+        """Ask the sender thread to ship the buffer now."""
+        self._wakeup.set()
+
+    def close(self):
+        """Ship (or spill) the remaining records and stop the sender thread.
+
+        Waits at most ``close_timeout`` seconds, so a stuck collector cannot
+        hang interpreter shutdown.
+        """
+        self._stop.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(self.close_timeout)
+        super().close()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            stopping = self._stop.is_set()
+            self._ship_buffer()
+            if stopping:
+                break
+        self._disconnect()
+
+    def _ship_buffer(self):
+        while self._buffer:
+            batch = []
+            while self._buffer and len(batch) < self.batch_size:
+                batch.append(self._buffer.popleft())
+            self._ship(batch)
+
+    def _ship(self, batch):
+        if self._connect():
+            try:
+                self._send(batch)
+                return
+            except OSError:
+                self._mark_unreachable()
+        self._spill(batch)
+
+    def _connect(self):
+        if self._sock is not None:
+            return True
+        if time.monotonic() < self._next_attempt:
+            return False
+
+        family, sock_type = self.TRANSPORTS[self.transport]
+        sock = socket.socket(family, sock_type)
+        sock.settimeout(self.send_timeout)
+        try:
+            sock.connect(self.address)
+        except OSError:
+            sock.close()
+            self._mark_unreachable()
+            return False
+
+        self._sock = sock
+        self._backoff = self.backoff_initial
+        self._replay_spill()
+        return self._sock is not None
+
+    def _disconnect(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _mark_unreachable(self):
+        self._disconnect()
+        self._next_attempt = time.monotonic() + self._backoff
+        self._backoff = min(self._backoff * 2, self.backoff_max)
+
+    def _send(self, batch):
+        if self.transport == 'unix_stream':
+            self._sock.sendall(('\n'.join(batch) + '\n').encode('utf-8'))
+            return
+        for datagram in self._datagrams(batch):
+            self._sock.send(datagram)
+
+    def _datagrams(self, batch):
+        """Pack newline-delimited records into datagrams of at most ``max_datagram_size`` bytes."""
+        datagram = bytearray()
+        for line in batch:
+            data = line.encode('utf-8')
+            if len(data) > self.max_datagram_size:
+                self.dropped += 1
+                continue
+            if datagram and len(datagram) + 1 + len(data) > self.max_datagram_size:
+                yield bytes(datagram)
+                datagram.clear()
+            if datagram:
+                datagram += b'\n'
+            datagram += data
+        if datagram:
+            yield bytes(datagram)
+
+    @contextmanager
+    def _spill_lock(self):
+        """Hold an exclusive lock on the spill file across processes."""
+        with open(self.spill_file + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _spill(self, batch):
+        try:
+            with self._spill_lock():
+                if os.path.exists(self.spill_file) and os.path.getsize(self.spill_file) >= self.spill_max_bytes:
+                    self.dropped += len(batch)
+                    return
+                with open(self.spill_file, 'a', encoding='utf-8') as spill:
+                    spill.write('\n'.join(batch) + '\n')
+        except OSError:
+            self.dropped += len(batch)
+
+    def _replay_spill(self):
+        """Send the spill file in batches; on failure keep only the unsent remainder."""
+        if not os.path.exists(self.spill_file):
+            return
+        with self._spill_lock():
+            self._replay_spill_locked()
+
+    def _replay_spill_locked(self):
+        # Another process may have replayed the file while we waited for the lock
+        if not os.path.exists(self.spill_file):
+            return
+        sent_offset = 0
+        with open(self.spill_file, 'rb') as spill:
+            try:
+                while True:
+                    batch = []
+                    while len(batch) < self.batch_size:
+                        line = spill.readline()
+                        if not line:
+                            break
+                        batch.append(line.rstrip(b'\n').decode('utf-8', errors='replace'))
+                    if not batch:
+                        break
+                    self._send(batch)
+                    sent_offset = spill.tell()
+            except OSError:
+                self._mark_unreachable()
+                self._truncate_spill(spill, sent_offset)
+                return
+        os.remove(self.spill_file)
+
+    def _truncate_spill(self, spill, sent_offset):
+        """Rewrite the spill file without its first ``sent_offset`` (already delivered) bytes."""
+        if sent_offset == 0:
+            return
+        temporary_path = self.spill_file + '.tmp'
+        spill.seek(sent_offset)
+        with open(temporary_path, 'wb') as remainder:
+            while chunk := spill.read(64 * 1024):
+                remainder.write(chunk)
+        os.replace(temporary_path, self.spill_file)
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import get_template
+from django.test import RequestFactory
+from django.urls import get_resolver, reverse
+
+from django_app.prerender import MANIFEST_NAME, STATIC_ROUTES
+
+
+class Command(BaseCommand):
+    help = "Render the views marked with @static_route into files served without live rendering."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            default=None,
+            help="Directory for the prerendered files (defaults to settings.PRERENDER_DIR).",
+        )
+
+    def handle(self, *args, **options):
+        output_dir = options['output_dir'] or settings.PRERENDER_DIR
+        os.makedirs(output_dir, exist_ok=True)
+        factory = RequestFactory()
+
+        # Importing the URLconf imports the views, which registers the static routes
+        get_resolver().url_patterns
+
+        manifest = {}
+        for url_name, route in STATIC_ROUTES.items():
+            request = factory.get(reverse(url_name))
+            response = route.view(request)
+            if response.status_code != 200:
+                raise CommandError(f"Static route {url_name!r} returned status {response.status_code}")
+            content = response.content
+
+            file_name = f"{url_name}.html"
+            self._write_atomically(os.path.join(output_dir, file_name), content)
+
+            template_path = get_template(route.template_name).origin.name
+            manifest[url_name] = {
+                'file': file_name,
+                'etag': '"%s"' % hashlib.sha256(content).hexdigest()[:32],
+                'content_length': len(content),
+                'content_type': response['Content-Type'],
+                'template_path': template_path,
+                'template_mtime': os.stat(template_path).st_mtime,
+            }
+            self.stdout.write(f"Prerendered {reverse(url_name)} -> {file_name} ({len(content)} bytes)")
+
+        # Written last, so servers only switch over once every file is in place
+        self._write_atomically(
+            os.path.join(output_dir, MANIFEST_NAME),
+            json.dumps(manifest, indent=2).encode('utf-8'),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Prerendered {len(manifest)} route(s) into {output_dir}"))
+
+    @staticmethod
+    def _write_atomically(path, content):
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as output:
+            output.write(content)
+        os.replace(temporary_path, path)
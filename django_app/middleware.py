@@ -1,19 +1,68 @@
 import json
 import logging
 import time
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 
+from .gc_monitor import AllocationTracker, gc_monitor
+from .log_sampling import ErrorBodyDeduplicator, LogSampler
+from .prerender import STATIC_ROUTES, serve_prerendered
+from .request_stats import request_stats
+from .watchdog import watchdog
+
+
+class PrerenderedPageMiddleware(MiddlewareMixin):
+    """Middleware to answer static routes from their prerendered files.
+
+    It goes last in MIDDLEWARE and hooks in once the URL is resolved, so a hit
+    only skips the view and its template rendering: the other middleware,
+    including RequestLoggingMiddleware and SecurityMiddleware, still run.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Serve a fresh prerendered file, or let the view render live."""
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        url_name = request.resolver_match.view_name
+        if url_name not in STATIC_ROUTES:
+            return None
+        return serve_prerendered(request, url_name)
+
 
 class RequestLoggingMiddleware(MiddlewareMixin):
     """Middleware to log all HTTP requests and responses."""
 
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.track_allocations = settings.TRACEMALLOC_REQUESTS_ENABLED
+        self.log_sampler = LogSampler(
+            keep_rate=settings.LOG_SAMPLING_KEEP_RATE,
+            slow_threshold=settings.LOG_SAMPLING_SLOW_THRESHOLD,
+            route_rates=settings.LOG_SAMPLING_ROUTE_RATES,
+        )
+        self.error_bodies = ErrorBodyDeduplicator(
+            max_bytes=settings.LOG_ERROR_BODY_MAX_BYTES,
+            max_entries=settings.LOG_ERROR_BODY_DEDUP_SIZE,
+        )
+
     def process_request(self, request):
         """Log request details and start timing."""
         request._request_start_time = time.time()
+        watchdog.request_started(request)
+        gc_monitor.request_started(request)
+        if self.track_allocations:
+            request._allocation_tracker = AllocationTracker().start()
         return None
 
     def process_response(self, request, response):
         """Log complete request/response information."""
+        # Read allocations first, before the logging work below allocates anything
+        allocation_tracker = getattr(request, '_allocation_tracker', None)
+        if allocation_tracker is not None:
+            allocation_tracker.stop()
+
+        watchdog.request_finished(request)
+        gc_stats = gc_monitor.request_finished(request)
         logger = logging.getLogger('django_app')
 
         # Calculate processing duration
@@ -21,11 +70,35 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         start_time = getattr(request, '_request_start_time', end_time)
         duration = end_time - start_time
 
+        processing_duration = round(duration * 1000, 2)  # in milliseconds
+        url = request.build_absolute_uri()
+        resolver_match = getattr(request, 'resolver_match', None)
+        route = '/' + resolver_match.route if resolver_match is not None else '<unmatched>'
+
+        # Keep a summary for the live recent/slowest requests view
+        request_stats.record({
+            "time": end_time,
+            "method": request.method,
+            "url": url,
+            "route": route,
+            "status": response.status_code,
+            "duration": processing_duration,
+        })
+
+        # Decide whether to log now that the status and duration are known
+        sample_weight = self.log_sampler.sample_weight(route, response.status_code, processing_duration)
+        if sample_weight is None:
+            return response
+
         # Get request body size
         request_body_size = len(getattr(request, 'body', b''))
 
-        # Get response body size
-        response_body_size = len(getattr(response, 'content', b''))
+        # Get response body size (streamed responses only know it from the header)
+        response_content = getattr(response, 'content', None)
+        if response_content is not None:
+            response_body_size = len(response_content)
+        else:
+            response_body_size = int(response.get('Content-Length') or 0)
 
         # Prepare request headers
         request_headers = {}
@@ -43,20 +116,30 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         # Create log entry
         log_data = {
             "method": request.method,
-            "url": request.build_absolute_uri(),
+            "url": url,
             "request_headers": request_headers,
             "request_body_size": request_body_size,
             "response_status": response.status_code,
             "response_headers": response_headers,
             "response_body_size": response_body_size,
-            "processing_duration": round(duration * 1000, 2)  # in milliseconds
+            "processing_duration": processing_duration,
+            "sample_weight": sample_weight,
         }
 
-        # Add response body if status is not successful
+        # Add GC pauses that overlapped this request
+        if gc_stats is not None:
+            log_data["gc_pause_duration"] = round(gc_stats.pause, 2)  # in milliseconds
+            log_data["gc_collections"] = gc_stats.collections
+
+        # Add allocations made while handling this request
+        if allocation_tracker is not None:
+            log_data["allocations"] = allocation_tracker.as_dict()
+
+        # Add response body (truncated, once per distinct body) if status is not successful
         if response.status_code >= 400:
             try:
-                log_data["response_body"] = response.content.decode('utf-8', errors='ignore')
-            except:
+                log_data.update(self.error_bodies.fields(response.content))
+            except Exception:
                 log_data["response_body"] = "<binary content>"
 
         # Log as JSON
@@ -0,0 +1,110 @@
+import json
+import os
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+MANIFEST_NAME = 'manifest.json'
+
+# Views marked with @static_route, keyed by URL name
+STATIC_ROUTES = {}
+
+
+class StaticRoute:
+    """A view whose output depends only on its template, not on the request."""
+
+    def __init__(self, url_name, template_name, view):
+        self.url_name = url_name
+        self.template_name = template_name
+        self.view = view
+
+
+def static_route(url_name, template_name):
+    """Mark a view as static so ``manage.py prerender`` renders it to a file at deploy time.
+
+    While the file is present and newer than the template, PrerenderedPageMiddleware
+    answers GET and HEAD requests from it; otherwise the view renders live.
+    """
+    def decorator(view):
+        STATIC_ROUTES[url_name] = StaticRoute(url_name, template_name, view)
+        return view
+
+    return decorator
+
+
+class _ManifestCache:
+    """The prerender manifest, reloaded only when the file on disk changes."""
+
+    def __init__(self):
+        self._key = None
+        self._manifest = {}
+
+    def get(self, output_dir):
+        path = os.path.join(output_dir, MANIFEST_NAME)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return {}
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key != self._key:
+            try:
+                with open(path, encoding='utf-8') as manifest_file:
+                    manifest = json.load(manifest_file)
+            except (OSError, ValueError):
+                return {}
+            self._manifest, self._key = manifest, key
+        return self._manifest
+
+
+_manifest_cache = _ManifestCache()
+
+
+def prerendered_entry(url_name):
+    """Return the manifest entry and file path for ``url_name``, or None if missing or stale."""
+    output_dir = settings.PRERENDER_DIR
+    entry = _manifest_cache.get(output_dir).get(url_name)
+    if entry is None:
+        return None
+    path = os.path.join(output_dir, entry['file'])
+    try:
+        if os.stat(path).st_size != entry['content_length']:
+            return None
+        if os.stat(entry['template_path']).st_mtime > entry['template_mtime']:
+            return None
+    except OSError:
+        return None
+    return entry, path
+
+
+def serve_prerendered(request, url_name):
+    """Serve the prerendered file for ``url_name``, or return None to fall back to live rendering.
+
+    The body goes out as a FileResponse, which WSGI servers providing
+    ``wsgi.file_wrapper`` (e.g. gunicorn) send with ``os.sendfile``.
+    """
+    found = prerendered_entry(url_name)
+    if found is None:
+        return None
+    entry, path = found
+
+    if _etag_matches(request.headers.get('If-None-Match'), entry['etag']):
+        response = HttpResponseNotModified()
+    elif request.method == 'HEAD':
+        response = HttpResponse(content_type=entry['content_type'])
+        response['Content-Length'] = entry['content_length']
+    else:
+        response = FileResponse(open(path, 'rb'), content_type=entry['content_type'])
+        response['Content-Length'] = entry['content_length']
+    response['ETag'] = entry['etag']
+    return response
+
+
+def _etag_matches(if_none_match, etag):
+    """Weak comparison of ``etag`` against an If-None-Match header, as RFC 9110 asks for."""
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    if '*' in etags:
+        return True
+    return etag.removeprefix('W/') in (candidate.removeprefix('W/') for candidate in etags)
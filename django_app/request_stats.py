@@ -0,0 +1,84 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class RequestStats:
+    """In-memory summaries of recent requests and the slowest requests per route.
+
+    Recent requests live in a fixed-size ring buffer. The slowest requests are
+    kept in size-K min-heaps per route, one set of heaps per time bucket; the
+    last ``BUCKETS`` buckets make up the sliding window, so older buckets fall
+    off the end and memory stays bounded. Recording is O(log K). Readers only
+    take atomic copies of the containers and never wait on the writers' lock.
+    """
+
+    # Number of time buckets the sliding window is split into
+    BUCKETS = 6
+
+    def __init__(self, recent_size=200, top_k=10, window=300.0):
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self.configure(recent_size, top_k, window)
+
+    def configure(self, recent_size, top_k, window):
+        """Resize the buffers (in entries) and the window (in seconds); clears all data."""
+        with self._lock:
+            self.top_k = top_k
+            self.window = window
+            self._recent = deque(maxlen=recent_size)
+            self._buckets = deque(maxlen=self.BUCKETS)
+
+    def clear(self):
+        """Drop all recorded requests."""
+        self.configure(self._recent.maxlen, self.top_k, self.window)
+
+    def _bucket_index(self, now):
+        return int(now // (self.window / self.BUCKETS))
+
+    def record(self, summary, now=None):
+        """Record a request summary with ``route`` and ``duration`` keys."""
+        if now is None:
+            now = time.monotonic()
+        self._recent.append(summary)
+
+        entry = (summary['duration'], next(self._sequence), summary)
+        index = self._bucket_index(now)
+        with self._lock:
+            if not self._buckets or self._buckets[-1][0] < index:
+                self._buckets.append((index, {}))
+            heap = self._buckets[-1][1].setdefault(summary['route'], [])
+            if len(heap) < self.top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    def recent(self):
+        """Return the recent request summaries, newest first."""
+        summaries = self._recent.copy()
+        summaries.reverse()
+        return list(summaries)
+
+    def slowest(self, now=None):
+        """Return the slowest request summaries per route within the window, slowest first."""
+        if now is None:
+            now = time.monotonic()
+        oldest = self._bucket_index(now) - self.BUCKETS + 1
+
+        entries = {}
+        for index, heaps in self._buckets.copy():
+            if index < oldest:
+                continue
+            for route, heap in heaps.copy().items():
+                entries.setdefault(route, []).extend(heap)
+
+        return {
+            route: [summary for _, _, summary in heapq.nlargest(self.top_k, route_entries)]
+            for route, route_entries in sorted(entries.items())
+        }
+
+
+# Shared instance used by RequestLoggingMiddleware and configured in AppConfig.ready()
+request_stats = RequestStats()
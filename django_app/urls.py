@@ -4,4 +4,7 @@ from . import views
 urlpatterns = [
     path('', views.home, name='home'),
     path('status', views.status, name='status'),
+    path('status.json', views.status_json, name='status_json'),
+    path('status/cluster', views.cluster_status, name='cluster_status'),
+    path('debug/requests', views.debug_requests, name='debug_requests'),
 ]
\ No newline at end of file
@@ -1,21 +1,71 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
 from django.shortcuts import render
+import hmac
 import platform
 import datetime
 import psutil
 
+from .cluster import cluster_status_aggregator
+from .gc_monitor import gc_monitor
+from .prerender import static_route
+from .request_stats import request_stats
 
+
+@static_route('home', 'django_app/home.html')
 def home(request):
     """Home page view that displays the HelloWorld greeting."""
     return render(request, 'django_app/home.html')
 
 
-def status(request):
-    """System status page view that displays system information."""
-    context = {
+def _status_data():
+    """Collect the system information shown on the status page."""
+    return {
         'os_name': platform.system(),
         'os_version': platform.release(),
         'current_datetime': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'cpu_usage': psutil.cpu_percent(interval=1),
         'memory_usage': psutil.virtual_memory().percent,
     }
-    return render(request, 'django_app/status.html', context)
+
+
+def status(request):
+    """System status page view that displays system information."""
+    return render(request, 'django_app/status.html', _status_data())
+
+
+def status_json(request):
+    """System status data as JSON, queried by peers for the cluster view."""
+    return JsonResponse(_status_data())
+
+
+def cluster_status(request):
+    """Cluster status page view that merges the status of all configured peers."""
+    cluster = cluster_status_aggregator.collect()
+    if request.GET.get('format') == 'json':
+        return JsonResponse(cluster)
+    return render(request, 'django_app/cluster_status.html', cluster)
+
+
+def _debug_access_allowed(request):
+    """Allow staff users and callers presenting the configured debug token."""
+    if request.user.is_staff:
+        return True
+    token = settings.DEBUG_ENDPOINT_TOKEN
+    return bool(token) and hmac.compare_digest(request.headers.get('X-Debug-Token', ''), token)
+
+
+def debug_requests(request):
+    """Debug page view that shows recent requests and the slowest requests per route."""
+    if not _debug_access_allowed(request):
+        raise PermissionDenied
+    context = {
+        'recent': request_stats.recent(),
+        'slowest': request_stats.slowest(),
+        'window': request_stats.window,
+    }
+    if request.GET.get('format') == 'json':
+        context['gc_pauses'] = gc_monitor.histograms()
+        return JsonResponse(context)
+    return render(request, 'django_app/debug_requests.html', context)
@@ -0,0 +1,148 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+
+class _InFlightRequest:
+    """A request currently being processed by a worker thread."""
+
+    __slots__ = ('request', 'start', 'captured')
+
+    def __init__(self, request, start):
+        self.request = request
+        self.start = start
+        self.captured = False
+
+
+class SlowRequestWatchdog:
+    """Background thread that dumps the stack of requests running too long.
+
+    Worker threads register themselves in a plain dict keyed by thread id;
+    single dict assignments are atomic, so the request path takes no lock.
+    Only the watchdog thread reads the dict (via an atomic copy) and only it
+    writes the ``captured`` flag, so each request is dumped at most once.
+
+    Threads do not survive ``fork``, so ``request_started`` restarts the
+    watchdog thread in each new process, e.g. in workers forked from a
+    preloading server (gunicorn ``--preload``).
+    """
+
+    def __init__(self, threshold=2.0, interval=0.5, logger_name='django_app.slow_requests'):
+        self.threshold = threshold
+        self.interval = interval
+        self.logger_name = logger_name
+        self._in_flight = {}
+        self._stop_event = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._enabled = False
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def configure(self, threshold=None, interval=None):
+        """Update the threshold and polling interval (in seconds)."""
+        if threshold is not None:
+            self.threshold = threshold
+        if interval is not None:
+            self.interval = interval
+
+    def start(self):
+        """Start the watchdog thread if it is not already running."""
+        self._enabled = True
+        self._ensure_thread()
+
+    def stop(self):
+        """Stop the watchdog thread and forget all in-flight requests."""
+        self._enabled = False
+        self._stop_event.set()
+        if self._thread is not None and self._thread_pid == os.getpid():
+            self._thread.join()
+        self._thread = None
+        self._thread_pid = None
+        self._in_flight.clear()
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        with self._start_lock:
+            if self._thread_pid == pid:
+                return
+            # In a forked child the parent's thread is gone and its in-flight
+            # entries belong to the parent's threads
+            self._in_flight.clear()
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='slow-request-watchdog', daemon=True)
+            self._thread.start()
+            self._thread_pid = pid
+
+    def request_started(self, request):
+        """Register the current thread's request. Called from the hot path."""
+        if not self._enabled:
+            return
+        if self._thread_pid != os.getpid():
+            self._ensure_thread()
+        self._in_flight[threading.get_ident()] = _InFlightRequest(request, time.monotonic())
+
+    def request_finished(self, request):
+        """Unregister the current thread's request. Called from the hot path."""
+        self._in_flight.pop(threading.get_ident(), None)
+
+    def check(self, now=None):
+        """Capture stacks of requests over the threshold; return the new records."""
+        if now is None:
+            now = time.monotonic()
+        overdue = [
+            (thread_id, entry)
+            for thread_id, entry in self._in_flight.copy().items()
+            if not entry.captured and now - entry.start >= self.threshold
+        ]
+        if not overdue:
+            return []
+
+        frames = sys._current_frames()
+        records = []
+        for thread_id, entry in overdue:
+            frame = frames.get(thread_id)
+            # The request may have finished between the copy and the snapshot
+            if frame is None or self._in_flight.get(thread_id) is not entry:
+                continue
+            entry.captured = True
+            record = self._build_record(entry, now, frame)
+            records.append(record)
+            logging.getLogger(self.logger_name).warning(
+                "Slow request %s %s running for %.2f ms\n%s",
+                record['method'],
+                record['url'],
+                record['elapsed'],
+                record['stack'],
+            )
+        return records
+
+    def _build_record(self, entry, now, frame):
+        request = entry.request
+        try:
+            url = request.build_absolute_uri()
+        except Exception:
+            url = getattr(request, 'path', '<unknown>')
+        return {
+            'method': getattr(request, 'method', None),
+            'url': url,
+            'elapsed': round((now - entry.start) * 1000, 2),  # in milliseconds
+            'stack': ''.join(traceback.format_stack(frame)),
+        }
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logging.getLogger(self.logger_name).exception("Slow request watchdog check failed")
+
+
+# Shared instance used by RequestLoggingMiddleware and started in AppConfig.ready()
+watchdog = SlowRequestWatchdog()
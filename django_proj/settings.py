@@ -51,6 +51,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django_app.middleware.RequestLoggingMiddleware',
+    'django_app.middleware.PrerenderedPageMiddleware',
 ]
 
 ROOT_URLCONF = 'django_proj.urls'
@@ -125,6 +126,61 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Slow-request watchdog: dump the stack of requests running longer than the threshold (seconds)
+SLOW_REQUEST_WATCHDOG_ENABLED = os.environ.get('SLOW_REQUEST_WATCHDOG_ENABLED', '1') == '1'
+
+SLOW_REQUEST_THRESHOLD = float(os.environ.get('SLOW_REQUEST_THRESHOLD', '2.0'))
+
+SLOW_REQUEST_WATCHDOG_INTERVAL = float(os.environ.get('SLOW_REQUEST_WATCHDOG_INTERVAL', '0.5'))
+
+# Record GC pause histograms and attribute pauses to in-flight requests
+GC_MONITOR_ENABLED = os.environ.get('GC_MONITOR_ENABLED', '1') == '1'
+
+# Add per-request tracemalloc allocation figures to the request log (slow; for debugging)
+TRACEMALLOC_REQUESTS_ENABLED = os.environ.get('TRACEMALLOC_REQUESTS_ENABLED', '0') == '1'
+
+# Cluster status: base URLs of the peers whose /status.json is merged into /status/cluster
+CLUSTER_PEERS = os.environ.get('CLUSTER_PEERS', '').split(',') if os.environ.get('CLUSTER_PEERS') else []
+
+CLUSTER_PEER_TIMEOUT = float(os.environ.get('CLUSTER_PEER_TIMEOUT', '3.0'))
+
+CLUSTER_STATUS_TTL = float(os.environ.get('CLUSTER_STATUS_TTL', '10.0'))
+
+# Live request statistics: ring buffer size, slowest requests kept per route, sliding window (seconds)
+REQUEST_STATS_RECENT_SIZE = int(os.environ.get('REQUEST_STATS_RECENT_SIZE', '200'))
+
+REQUEST_STATS_TOP_K = int(os.environ.get('REQUEST_STATS_TOP_K', '10'))
+
+REQUEST_STATS_WINDOW = float(os.environ.get('REQUEST_STATS_WINDOW', '300.0'))
+
+# Token accepted in the X-Debug-Token header by the debug endpoints (staff users need none)
+DEBUG_ENDPOINT_TOKEN = os.environ.get('DEBUG_ENDPOINT_TOKEN', '')
+
+# Request log sampling: keep rate for successful fast requests, slow threshold (ms) above which
+# requests are always kept, and per-route keep rates, e.g. {'/status.json': 0.01}. Errors are always kept.
+LOG_SAMPLING_KEEP_RATE = float(os.environ.get('LOG_SAMPLING_KEEP_RATE', '1.0'))
+
+LOG_SAMPLING_SLOW_THRESHOLD = float(os.environ.get('LOG_SAMPLING_SLOW_THRESHOLD', '500.0'))
+
+LOG_SAMPLING_ROUTE_RATES = {}
+
+# Error response bodies in the request log: truncation length and number of body hashes remembered
+LOG_ERROR_BODY_MAX_BYTES = int(os.environ.get('LOG_ERROR_BODY_MAX_BYTES', '4096'))
+
+LOG_ERROR_BODY_DEDUP_SIZE = int(os.environ.get('LOG_ERROR_BODY_DEDUP_SIZE', '1024'))
+
+# Output of `manage.py prerender`: static routes are served from here while the files are fresh
+PRERENDER_DIR = os.environ.get('PRERENDER_DIR', str(BASE_DIR / 'prerendered'))
+
+# Request log sink: 'file' writes server.log, 'socket' ships batches to a local collector
+LOG_SINK = os.environ.get('LOG_SINK', 'file')
+
+LOG_SHIPPING_TRANSPORT = os.environ.get('LOG_SHIPPING_TRANSPORT', 'unix_dgram')
+
+LOG_SHIPPING_ADDRESS = os.environ.get('LOG_SHIPPING_ADDRESS', '/tmp/django_app_logs.sock')
+
+LOG_SHIPPING_FORMAT = os.environ.get('LOG_SHIPPING_FORMAT', 'compact')
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -141,6 +197,15 @@ LOGGING = {
             'filename': os.environ.get('SERVER_LOG_FILE_NAME', 'server.log'),
             'formatter': 'json',
         },
+        'slow_requests_file': {
+            'level': 'WARNING',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': os.environ.get('SLOW_REQUEST_LOG_FILE_NAME', 'slow_requests.log'),
+            'maxBytes': 1024 * 1024,
+            'backupCount': 3,
+            'delay': True,
+            'formatter': 'json',
+        },
     },
     'loggers': {
         'django_app': {
@@ -148,5 +213,22 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        'django_app.slow_requests': {
+            'handlers': ['slow_requests_file'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
+
+if LOG_SINK == 'socket':
+    LOGGING['handlers']['socket'] = {
+        'level': 'INFO',
+        'class': 'django_app.log_shipping.SocketBatchHandler',
+        'transport': LOG_SHIPPING_TRANSPORT,
+        'address': LOG_SHIPPING_ADDRESS,
+        'record_format': LOG_SHIPPING_FORMAT,
+        'spill_file': os.environ.get('LOG_SHIPPING_SPILL_FILE_NAME', 'log_spill.jsonl'),
+        'formatter': 'json',
+    }
+    LOGGING['loggers']['django_app']['handlers'] = ['socket']
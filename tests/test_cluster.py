@@ -0,0 +1,204 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from django.test import TestCase, Client, override_settings
+
+from django_app.cluster import ClusterStatusAggregator, cluster_status_aggregator
+
+
+class _PeerHandler(BaseHTTPRequestHandler):
+    """Stand-in peer serving canned /status.json data."""
+
+    def do_GET(self):
+        self.server.hits += 1
+        time.sleep(self.server.delay)
+        body = json.dumps(self.server.status).encode()
+        self.send_response(200 if self.path == '/status.json' else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_peer(cpu_usage, memory_usage, delay=0.0):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _PeerHandler)
+    server.daemon_threads = True
+    server.hits = 0
+    server.delay = delay
+    server.status = {
+        'os_name': 'Linux',
+        'os_version': '6.1',
+        'current_datetime': '2025-01-01 00:00:00',
+        'cpu_usage': cpu_usage,
+        'memory_usage': memory_usage,
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _peer_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+class TestClusterStatusAggregator(TestCase):
+    """Test cases for ClusterStatusAggregator class."""
+
+    def setUp(self):
+        """Start stand-in peers on loopback ports."""
+        self.fast_peers = [_start_peer(20.0, 40.0), _start_peer(40.0, 60.0)]
+        self.slow_peer = _start_peer(90.0, 90.0, delay=2.0)
+        self.aggregator = ClusterStatusAggregator()
+
+    def tearDown(self):
+        """Stop the stand-in peers."""
+        for server in self.fast_peers + [self.slow_peer]:
+            server.shutdown()
+            server.server_close()
+
+    @pytest.mark.timeout(30)
+    def test_collect_merges_peers_concurrently(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: ClusterStatusAggregator.collect
+        """
+        peers = [_peer_url(server) for server in self.fast_peers]
+        peers += [_peer_url(self.slow_peer), _closed_port_url()]
+
+        with self.settings(CLUSTER_PEERS=peers, CLUSTER_PEER_TIMEOUT=0.5, CLUSTER_STATUS_TTL=60):
+            started = time.monotonic()
+            cluster = self.aggregator.collect()
+            elapsed = time.monotonic() - started
+
+        # The slow peer is bounded by its own timeout, not added to the others
+        self.assertLess(elapsed, 1.5)
+
+        self.assertEqual(cluster['summary']['nodes'], 4)
+        self.assertEqual(cluster['summary']['healthy'], 2)
+        self.assertEqual(cluster['summary']['cpu_usage'], 30.0)
+        self.assertEqual(cluster['summary']['memory_usage'], 50.0)
+
+        nodes = cluster['nodes']
+        self.assertEqual([node['peer'] for node in nodes], peers)
+        self.assertEqual([node['ok'] for node in nodes], [True, True, False, False])
+        self.assertEqual(nodes[0]['status']['cpu_usage'], 20.0)
+        self.assertEqual(nodes[2]['error'], 'timed out after 0.5s')
+        self.assertNotIn('checked', nodes[0])
+
+    @pytest.mark.timeout(30)
+    def test_collect_marks_misbehaving_peers_unhealthy(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: ClusterStatusAggregator._fetch_peer
+        """
+        list_peer = _start_peer(0.0, 0.0)
+        list_peer.status = []
+        huge_peer = _start_peer(0.0, 0.0)
+        huge_peer.status = {'padding': 'x' * (2 * 1024 * 1024)}
+        self.fast_peers += [list_peer, huge_peer]
+        peers = [_peer_url(self.fast_peers[0]), _peer_url(list_peer), _peer_url(huge_peer)]
+
+        with self.settings(CLUSTER_PEERS=peers, CLUSTER_PEER_TIMEOUT=5, CLUSTER_STATUS_TTL=60):
+            cluster = self.aggregator.collect()
+
+        self.assertEqual(cluster['summary']['healthy'], 1)
+        self.assertEqual(cluster['summary']['cpu_usage'], 20.0)
+        nodes = cluster['nodes']
+        self.assertEqual([node['ok'] for node in nodes], [True, False, False])
+        self.assertEqual(nodes[1]['error'], 'status is not a JSON object')
+        self.assertEqual(nodes[2]['error'], 'response larger than 1048576 bytes')
+
+    @pytest.mark.timeout(30)
+    def test_collect_serves_cache_within_ttl(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: ClusterStatusAggregator.collect
+        """
+        peer = self.fast_peers[0]
+
+        with self.settings(CLUSTER_PEERS=[_peer_url(peer)], CLUSTER_PEER_TIMEOUT=0.5, CLUSTER_STATUS_TTL=60):
+            self.aggregator.collect()
+            self.aggregator.collect()
+
+        self.assertEqual(peer.hits, 1)
+
+    @pytest.mark.timeout(30)
+    def test_collect_refreshes_stale_peers_in_background(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: ClusterStatusAggregator.collect
+        """
+        peer = self.fast_peers[0]
+
+        with self.settings(CLUSTER_PEERS=[_peer_url(peer)], CLUSTER_PEER_TIMEOUT=0.5, CLUSTER_STATUS_TTL=0):
+            self.aggregator.collect()
+            peer.status['cpu_usage'] = 75.0
+
+            # The stale result is served immediately while the refresh runs
+            cluster = self.aggregator.collect()
+            self.assertEqual(cluster['nodes'][0]['status']['cpu_usage'], 20.0)
+
+            deadline = time.monotonic() + 5
+            while peer.hits < 2 or self.aggregator._refreshing:
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+            cluster = self.aggregator.collect()
+
+        self.assertEqual(cluster['nodes'][0]['status']['cpu_usage'], 75.0)
+
+
+class TestClusterStatusView(TestCase):
+    """Test cases for the cluster status view endpoint."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        self.peer = _start_peer(20.0, 40.0)
+        cluster_status_aggregator.clear()
+
+    def tearDown(self):
+        """Stop the stand-in peer."""
+        self.peer.shutdown()
+        self.peer.server_close()
+        cluster_status_aggregator.clear()
+
+    @pytest.mark.timeout(30)
+    def test_cluster_status_endpoint(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: cluster_status
+        """
+        with override_settings(CLUSTER_PEERS=[_peer_url(self.peer)], CLUSTER_PEER_TIMEOUT=0.5):
+            response = self.client.get('/status/cluster')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'django_app/cluster_status.html')
+        self.assertContains(response, 'Cluster Status')
+        self.assertContains(response, _peer_url(self.peer))
+        self.assertContains(response, '1 / 1')
+
+    @pytest.mark.timeout(30)
+    def test_cluster_status_endpoint_json(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: cluster_status
+        """
+        with override_settings(CLUSTER_PEERS=[_peer_url(self.peer)], CLUSTER_PEER_TIMEOUT=0.5):
+            response = self.client.get('/status/cluster?format=json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = response.json()
+        self.assertEqual(data['summary']['healthy'], 1)
+        self.assertEqual(data['nodes'][0]['status']['memory_usage'], 40.0)
@@ -0,0 +1,138 @@
+import gc
+import tracemalloc
+from unittest.mock import Mock
+import pytest
+from django.http import HttpRequest, HttpResponse
+from django.test import TestCase, Client, RequestFactory
+
+from django_app.gc_monitor import AllocationTracker, GCMonitor
+from django_app.middleware import RequestLoggingMiddleware
+
+
+class TestGCMonitor(TestCase):
+    """Test cases for GCMonitor class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.monitor = GCMonitor()
+        self.monitor.install()
+        self.request = Mock(spec=HttpRequest)
+
+    def tearDown(self):
+        """Remove the monitor from gc.callbacks."""
+        self.monitor.uninstall()
+
+    @pytest.mark.timeout(30)
+    def test_record_pause(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: GCMonitor.record_pause
+        """
+        self.monitor.request_started(self.request)
+
+        self.monitor.record_pause(0, 0.05)
+        self.monitor.record_pause(2, 7.5)
+        self.monitor.record_pause(2, 900.0)
+
+        histograms = self.monitor.histograms()
+        self.assertEqual(histograms['0']['collections'], 1)
+        self.assertEqual(histograms['0']['buckets']['<=0.1'], 1)
+        self.assertEqual(histograms['1']['collections'], 0)
+        self.assertEqual(histograms['2']['collections'], 2)
+        self.assertEqual(histograms['2']['buckets']['<=10'], 1)
+        self.assertEqual(histograms['2']['buckets']['>500'], 1)
+        self.assertEqual(histograms['2']['total_pause'], 907.5)
+
+        # Every pause is attributed to the in-flight request
+        stats = self.monitor.request_finished(self.request)
+        self.assertEqual(stats.collections, 3)
+        self.assertAlmostEqual(stats.pause, 907.55)
+
+    @pytest.mark.timeout(30)
+    def test_gc_callback_records_collection(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: GCMonitor._callback
+        """
+        self.monitor.request_started(self.request)
+
+        gc.collect(1)
+
+        self.assertEqual(self.monitor.histograms()['1']['collections'], 1)
+        self.assertEqual(self.monitor.request_finished(self.request).collections, 1)
+
+    @pytest.mark.timeout(30)
+    def test_request_finished_untracked(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: GCMonitor.request_finished
+        """
+        self.monitor.uninstall()
+        self.monitor.request_started(self.request)
+
+        self.assertIsNone(self.monitor.request_finished(self.request))
+
+
+class TestAllocationBudgets(TestCase):
+    """Allocation budgets for the request path, measured with tracemalloc."""
+
+    # Peak bytes allocated while handling one request
+    MIDDLEWARE_BUDGET = 16 * 1024
+    HOME_BUDGET = 256 * 1024
+    STATUS_BUDGET = 512 * 1024
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        """Stop tracing started by AllocationTracker."""
+        tracemalloc.stop()
+
+    def _measure_view(self, url):
+        # Warm up template loading and lazy imports first
+        self.client.get(url)
+        with AllocationTracker() as tracker:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return tracker
+
+    @pytest.mark.timeout(30)
+    def test_middleware_allocation_budget(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: RequestLoggingMiddleware.process_response
+        """
+        middleware = RequestLoggingMiddleware(get_response=lambda request: HttpResponse())
+        response = HttpResponse(b'<html>' * 100)
+        request = self.factory.get('/')
+        middleware.process_request(request)
+        middleware.process_response(request, response)
+
+        request = self.factory.get('/')
+        middleware.process_request(request)
+        with AllocationTracker() as tracker:
+            middleware.process_response(request, response)
+
+        self.assertLess(tracker.peak_bytes, self.MIDDLEWARE_BUDGET)
+
+    @pytest.mark.timeout(30)
+    def test_home_allocation_budget(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: home
+        """
+        tracker = self._measure_view('/')
+
+        self.assertLess(tracker.peak_bytes, self.HOME_BUDGET)
+
+    @pytest.mark.timeout(30)
+    def test_status_allocation_budget(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: status
+        """
+        tracker = self._measure_view('/status')
+
+        self.assertLess(tracker.peak_bytes, self.STATUS_BUDGET)
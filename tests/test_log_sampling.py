@@ -0,0 +1,84 @@
+import pytest
+from django.test import TestCase
+
+from django_app.log_sampling import ErrorBodyDeduplicator, LogSampler
+
+
+class TestLogSampler(TestCase):
+    """Test cases for LogSampler class."""
+
+    @pytest.mark.timeout(30)
+    def test_sample_weight_keeps_errors_and_slow_requests(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: LogSampler.sample_weight
+        """
+        sampler = LogSampler(keep_rate=0.0, slow_threshold=500.0)
+
+        self.assertEqual(sampler.sample_weight('/', 404, 1.0), 1.0)
+        self.assertEqual(sampler.sample_weight('/', 500, 1.0), 1.0)
+        self.assertEqual(sampler.sample_weight('/', 200, 500.0), 1.0)
+        self.assertIsNone(sampler.sample_weight('/', 200, 499.0))
+
+    @pytest.mark.timeout(30)
+    def test_sample_weight_applies_keep_rate(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: LogSampler.sample_weight
+        """
+        draws = iter([0.1, 0.3])
+        sampler = LogSampler(keep_rate=0.25, rng=lambda: next(draws))
+
+        # Kept records are weighted by the inverse of the keep rate
+        self.assertEqual(sampler.sample_weight('/', 200, 1.0), 4.0)
+        self.assertIsNone(sampler.sample_weight('/', 200, 1.0))
+
+    @pytest.mark.timeout(30)
+    def test_sample_weight_route_overrides(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: LogSampler.sample_weight
+        """
+        sampler = LogSampler(keep_rate=1.0, route_rates={'/status': 0.0, '/': 0.5}, rng=lambda: 0.4)
+
+        self.assertIsNone(sampler.sample_weight('/status', 200, 1.0))
+        self.assertEqual(sampler.sample_weight('/', 200, 1.0), 2.0)
+        self.assertEqual(sampler.sample_weight('/status/cluster', 200, 1.0), 1.0)
+
+
+class TestErrorBodyDeduplicator(TestCase):
+    """Test cases for ErrorBodyDeduplicator class."""
+
+    @pytest.mark.timeout(30)
+    def test_fields_truncates_body(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: ErrorBodyDeduplicator.fields
+        """
+        deduplicator = ErrorBodyDeduplicator(max_bytes=4)
+
+        fields = deduplicator.fields(b'Server Error')
+
+        self.assertEqual(fields['response_body'], 'Serv')
+        self.assertTrue(fields['response_body_truncated'])
+        self.assertEqual(len(fields['response_body_hash']), 32)
+
+    @pytest.mark.timeout(30)
+    def test_fields_deduplicates_by_hash(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: ErrorBodyDeduplicator.fields
+        """
+        deduplicator = ErrorBodyDeduplicator(max_entries=2)
+
+        first = deduplicator.fields(b'Not Found')
+        repeat = deduplicator.fields(b'Not Found')
+
+        self.assertEqual(first['response_body'], 'Not Found')
+        self.assertNotIn('response_body_truncated', first)
+        self.assertEqual(repeat, {'response_body_hash': first['response_body_hash'], 'response_body_duplicate': True})
+
+        # Only the most recent hashes are remembered
+        deduplicator.fields(b'Bad Request')
+        deduplicator.fields(b'Forbidden')
+        self.assertEqual(deduplicator.fields(b'Not Found')['response_body'], 'Not Found')
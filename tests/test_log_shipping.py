@@ -0,0 +1,265 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from unittest import skipUnless
+from unittest.mock import patch
+import pytest
+from django.test import TestCase
+
+from django_app.log_collector import LogCollector
+from django_app.log_shipping import SocketBatchHandler
+
+
+def _record(message):
+    return logging.LogRecord('django_app', logging.INFO, __file__, 0, message, None, None)
+
+
+class TestSocketBatchHandler(TestCase):
+    """Test cases for SocketBatchHandler class."""
+
+    def setUp(self):
+        """Set up a scratch directory for sockets and spill files."""
+        self.directory = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.directory, 'collector.sock')
+        self.spill_file = os.path.join(self.directory, 'spill.jsonl')
+        self.handlers = []
+        self.collectors = []
+
+    def tearDown(self):
+        """Close handlers and collectors and remove the scratch directory."""
+        for handler in self.handlers:
+            handler.close()
+        for collector in self.collectors:
+            collector.stop()
+        shutil.rmtree(self.directory)
+
+    def _handler(self, transport, address, **kwargs):
+        handler = SocketBatchHandler(address, transport=transport, spill_file=self.spill_file, **kwargs)
+        self.handlers.append(handler)
+        return handler
+
+    def _collector(self, transport, address):
+        collector = LogCollector(transport, address).start()
+        self.collectors.append(collector)
+        return collector
+
+    @pytest.mark.timeout(30)
+    def test_ships_batches_over_each_transport(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SocketBatchHandler.emit
+        """
+        for transport, address in [
+            ('unix_dgram', self.socket_path),
+            ('unix_stream', self.socket_path + '.stream'),
+            ('udp', '127.0.0.1:0'),
+        ]:
+            with self.subTest(transport=transport):
+                collector = self._collector(transport, address)
+                handler = self._handler(transport, collector.address, batch_size=10, flush_interval=0.05)
+
+                for index in range(25):
+                    handler.emit(_record(json.dumps({"index": index})))
+
+                self.assertTrue(collector.wait_for(25, timeout=5))
+                self.assertEqual([json.loads(line)["index"] for line in collector.records], list(range(25)))
+
+    @pytest.mark.timeout(30)
+    def test_json_record_format(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SocketBatchHandler.serialize
+        """
+        collector = self._collector('unix_dgram', self.socket_path)
+        handler = self._handler('unix_dgram', self.socket_path, record_format='json', flush_interval=0.05)
+
+        handler.emit(_record("Stopping server\nbye"))
+
+        self.assertTrue(collector.wait_for(1, timeout=5))
+        shipped = json.loads(collector.records[0])
+        self.assertEqual(shipped["message"], "Stopping server\nbye")
+        self.assertEqual(shipped["level"], "INFO")
+        self.assertEqual(shipped["logger"], "django_app")
+
+    @pytest.mark.timeout(30)
+    def test_spills_while_unreachable_and_replays(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SocketBatchHandler._ship
+        """
+        handler = self._handler('unix_stream', self.socket_path, flush_interval=0.05,
+                                backoff_initial=0.05, backoff_max=0.1)
+
+        # No collector yet: records go to the spill file
+        handler.emit(_record("first"))
+        handler.emit(_record("second"))
+        deadline = time.monotonic() + 5
+        while not os.path.exists(self.spill_file):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+        # Once the collector is up the spill file is replayed before new records
+        collector = self._collector('unix_stream', self.socket_path)
+        handler.emit(_record("third"))
+
+        self.assertTrue(collector.wait_for(3, timeout=5))
+        self.assertEqual(collector.records, ["first", "second", "third"])
+        self.assertFalse(os.path.exists(self.spill_file))
+
+    @pytest.mark.timeout(30)
+    def test_replay_keeps_only_unsent_remainder(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SocketBatchHandler._replay_spill
+        """
+        handler = self._handler('unix_stream', self.socket_path, batch_size=3)
+        with open(self.spill_file, 'w') as spill:
+            spill.write(''.join(f"{index}\n" for index in range(10)))
+        sent = []
+
+        def send(batch):
+            if len(sent) == 2:
+                raise OSError("collector went away")
+            sent.append(batch)
+
+        # The third batch fails: the two delivered batches are not replayed again
+        with patch.object(handler, '_send', side_effect=send):
+            handler._replay_spill()
+
+        self.assertEqual(sent, [['0', '1', '2'], ['3', '4', '5']])
+        with open(self.spill_file) as spill:
+            self.assertEqual(spill.read().splitlines(), ['6', '7', '8', '9'])
+
+        # The next replay sends the remainder and removes the file
+        with patch.object(handler, '_send', side_effect=sent.append):
+            handler._replay_spill()
+
+        self.assertEqual(sent[2:], [['6', '7', '8'], ['9']])
+        self.assertFalse(os.path.exists(self.spill_file))
+
+    @pytest.mark.timeout(30)
+    def test_spill_waits_for_other_process_lock(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SocketBatchHandler._spill
+        """
+        handler = self._handler('unix_stream', self.socket_path)
+
+        # Another worker holds the spill lock, e.g. while replaying
+        with open(self.spill_file + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            spiller = threading.Thread(target=handler._spill, args=(["late"],))
+            spiller.start()
+            spiller.join(0.2)
+            self.assertTrue(spiller.is_alive())
+            self.assertFalse(os.path.exists(self.spill_file))
+        spiller.join(5)
+
+        with open(self.spill_file) as spill:
+            self.assertEqual(spill.read().splitlines(), ["late"])
+
+    @pytest.mark.timeout(30)
+    def test_close_does_not_hang_on_stalled_collector(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SocketBatchHandler.close
+        """
+        # A collector that accepts connections but never reads
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+        server.bind(self.socket_path)
+        server.listen()
+        handler = SocketBatchHandler(self.socket_path, transport='unix_stream', spill_file=self.spill_file,
+                                     batch_size=10, flush_interval=60, send_timeout=0.2)
+
+        for index in range(200):
+            handler.emit(_record(f"{index:05d}" + "x" * 50000))
+        started = time.monotonic()
+        handler.close()
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertFalse(handler._thread.is_alive())
+        self.assertTrue(os.path.exists(self.spill_file))
+
+    @pytest.mark.timeout(30)
+    @skipUnless(hasattr(os, 'fork'), "requires os.fork")
+    def test_forked_child_starts_own_sender(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SocketBatchHandler.emit
+        """
+        collector = self._collector('unix_dgram', self.socket_path)
+        handler = self._handler('unix_dgram', self.socket_path, flush_interval=0.05)
+
+        # No sender thread until the first record in this process
+        self.assertIsNone(handler._thread)
+        handler.emit(_record("parent"))
+        self.assertTrue(collector.wait_for(1, timeout=5))
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                for index in range(5):
+                    handler.emit(_record(f"child {index}"))
+                handler.close()
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+
+        self.assertTrue(collector.wait_for(6, timeout=5))
+        self.assertEqual(collector.records, ["parent"] + [f"child {index}" for index in range(5)])
+
+    @pytest.mark.timeout(30)
+    def test_buffer_is_bounded(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SocketBatchHandler.emit
+        """
+        handler = self._handler('unix_dgram', self.socket_path, buffer_size=5, batch_size=100, flush_interval=60)
+
+        for index in range(8):
+            handler.emit(_record(str(index)))
+
+        self.assertEqual(list(handler._buffer), ['3', '4', '5', '6', '7'])
+        self.assertEqual(handler.dropped, 3)
+
+    @pytest.mark.timeout(60)
+    def test_end_to_end_throughput(self):
+        """
+        Test kind: performance_tests
+        Original method FQN: SocketBatchHandler.emit
+        """
+        collector = self._collector('unix_dgram', self.socket_path)
+        handler = self._handler('unix_dgram', self.socket_path, batch_size=500, buffer_size=100000,
+                                flush_interval=0.05)
+        logger = logging.getLogger('tests.log_shipping')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        message = json.dumps({
+            "method": "GET",
+            "url": "http://testserver/",
+            "response_status": 200,
+            "processing_duration": 1.23,
+        })
+        total = 20000
+
+        try:
+            started = time.perf_counter()
+            for _ in range(total):
+                logger.info(message)
+            self.assertTrue(collector.wait_for(total, timeout=30))
+            elapsed = time.perf_counter() - started
+        finally:
+            logger.removeHandler(handler)
+
+        records_per_second = total / elapsed
+        print(f"\nSocketBatchHandler unix_dgram throughput: {records_per_second:,.0f} records/s")
+        self.assertEqual(handler.dropped, 0)
+        self.assertGreater(records_per_second, 1000)
@@ -1,6 +1,7 @@
 import json
 import logging
 import time
+import tracemalloc
 from unittest.mock import Mock, patch, MagicMock
 import pytest
 from django.http import HttpRequest, HttpResponse
@@ -218,4 +219,125 @@ class TestRequestLoggingMiddleware(TestCase):
         log_data = json.loads(logged_json)
 
         # Verify binary content handling
-        self.assertEqual(log_data['response_body'], '<binary content>')
\ No newline at end of file
+        self.assertEqual(log_data['response_body'], '<binary content>')
+
+    @pytest.mark.timeout(30)
+    @patch('django_app.middleware.logging.getLogger')
+    def test_process_response_allocations(self, mock_get_logger):
+        """
+        Test kind: unit_tests
+        Original method FQN: RequestLoggingMiddleware.process_response
+        """
+        # Set up mocks
+        mock_logger = Mock()
+        mock_get_logger.return_value = mock_logger
+
+        with self.settings(TRACEMALLOC_REQUESTS_ENABLED=True):
+            middleware = RequestLoggingMiddleware(get_response=lambda request: HttpResponse())
+
+        request = Mock(spec=HttpRequest)
+        request.method = 'GET'
+        request.build_absolute_uri.return_value = 'http://testserver/'
+        request.META = {}
+        request.body = b''
+
+        response = Mock(spec=HttpResponse)
+        response.status_code = 200
+        response.content = b''
+        response.items.return_value = []
+
+        # Call the methods
+        try:
+            middleware.process_request(request)
+            middleware.process_response(request, response)
+        finally:
+            tracemalloc.stop()
+
+        # Parse the logged JSON data
+        logged_json = mock_logger.info.call_args[0][0]
+        log_data = json.loads(logged_json)
+
+        # Verify allocation figures are included
+        self.assertEqual(
+            set(log_data['allocations']),
+            {'peak_bytes', 'retained_bytes', 'retained_blocks'},
+        )
+        self.assertGreaterEqual(log_data['allocations']['peak_bytes'], 0)
+
+    @pytest.mark.timeout(30)
+    @patch('django_app.middleware.logging.getLogger')
+    @patch('time.time')
+    def test_process_response_sampled_out(self, mock_time, mock_get_logger):
+        """
+        Test kind: unit_tests
+        Original method FQN: RequestLoggingMiddleware.process_response
+        """
+        # Set up mocks
+        mock_logger = Mock()
+        mock_get_logger.return_value = mock_logger
+        mock_time.return_value = 1234567890.133
+
+        with self.settings(LOG_SAMPLING_KEEP_RATE=0.0):
+            middleware = RequestLoggingMiddleware(get_response=lambda request: HttpResponse())
+
+        request = Mock(spec=HttpRequest)
+        request._request_start_time = 1234567890.123
+        request.method = 'GET'
+        request.build_absolute_uri.return_value = 'http://testserver/'
+        request.META = {}
+        request.body = b''
+
+        response = Mock(spec=HttpResponse)
+        response.status_code = 200
+        response.content = b''
+        response.items.return_value = []
+
+        # Fast successful request is dropped
+        result = middleware.process_response(request, response)
+        self.assertEqual(result, response)
+        mock_logger.info.assert_not_called()
+
+        # Errors are always kept, with full weight
+        response.status_code = 500
+        middleware.process_response(request, response)
+        log_data = json.loads(mock_logger.info.call_args[0][0])
+        self.assertEqual(log_data['response_status'], 500)
+        self.assertEqual(log_data['sample_weight'], 1.0)
+
+    @pytest.mark.timeout(30)
+    @patch('django_app.middleware.logging.getLogger')
+    @patch('time.time')
+    def test_process_response_repeated_error_body(self, mock_time, mock_get_logger):
+        """
+        Test kind: unit_tests
+        Original method FQN: RequestLoggingMiddleware.process_response
+        """
+        # Set up mocks
+        mock_logger = Mock()
+        mock_get_logger.return_value = mock_logger
+        mock_time.return_value = 1234567891.123
+
+        request = Mock(spec=HttpRequest)
+        request._request_start_time = 1234567890.123
+        request.method = 'GET'
+        request.build_absolute_uri.return_value = 'http://testserver/missing'
+        request.META = {}
+        request.body = b''
+
+        response = Mock(spec=HttpResponse)
+        response.status_code = 404
+        response.content = b'Not Found' * 1000
+        response.items.return_value = []
+
+        # Call the method twice with the same error page
+        self.middleware.process_response(request, response)
+        first = json.loads(mock_logger.info.call_args[0][0])
+        self.middleware.process_response(request, response)
+        repeat = json.loads(mock_logger.info.call_args[0][0])
+
+        # The body is truncated and stored only once
+        self.assertEqual(len(first['response_body']), 4096)
+        self.assertTrue(first['response_body_truncated'])
+        self.assertNotIn('response_body', repeat)
+        self.assertTrue(repeat['response_body_duplicate'])
+        self.assertEqual(repeat['response_body_hash'], first['response_body_hash'])
@@ -0,0 +1,212 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from io import BytesIO, StringIO
+from wsgiref.util import FileWrapper
+import pytest
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.http import FileResponse
+from django.test import TestCase, Client, RequestFactory, override_settings
+
+from django_app.request_stats import request_stats
+
+
+class TestPrerender(TestCase):
+    """Test cases for the prerender command and the prerendered serving path."""
+
+    def setUp(self):
+        """Prerender into a scratch directory."""
+        self.client = Client()
+        self.directory = tempfile.mkdtemp()
+        self.override = override_settings(PRERENDER_DIR=self.directory)
+        self.override.enable()
+        call_command('prerender', stdout=StringIO())
+        with open(os.path.join(self.directory, 'manifest.json')) as manifest_file:
+            self.entry = json.load(manifest_file)['home']
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        self.override.disable()
+        shutil.rmtree(self.directory)
+
+    def _body(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    @pytest.mark.timeout(30)
+    def test_prerender_command(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: Command.handle
+        """
+        with open(os.path.join(self.directory, 'home.html'), 'rb') as prerendered:
+            content = prerendered.read()
+
+        self.assertIn(b'Hello from CodeSpeak!', content)
+        self.assertIn(b'href="/status"', content)
+        self.assertEqual(self.entry['content_length'], len(content))
+        self.assertEqual(self.entry['content_type'], 'text/html; charset=utf-8')
+        self.assertTrue(self.entry['etag'].startswith('"'))
+
+    @pytest.mark.timeout(30)
+    def test_home_served_from_file(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: home
+        """
+        response = self.client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response['ETag'], self.entry['etag'])
+        self.assertEqual(response['Content-Length'], str(self.entry['content_length']))
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        self.assertIn(b'Hello from CodeSpeak!', self._body(response))
+
+        # The rest of the middleware stack still runs
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+
+    @pytest.mark.timeout(30)
+    def test_home_not_modified(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: home
+        """
+        etag = self.entry['etag']
+        for if_none_match in [etag, 'W/' + etag, '"other", ' + etag, '*']:
+            with self.subTest(if_none_match=if_none_match):
+                response = self.client.get('/', headers={'If-None-Match': if_none_match})
+
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get('/', headers={'If-None-Match': '"other"'})
+        self.assertEqual(response.status_code, 200)
+
+    @pytest.mark.timeout(30)
+    def test_home_head_served_from_file(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: home
+        """
+        response = self.client.head('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.content), 0)
+        self.assertEqual(response['Content-Length'], str(self.entry['content_length']))
+
+    @pytest.mark.timeout(30)
+    def test_home_served_from_file_is_logged(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: PrerenderedPageMiddleware.process_view
+        """
+        request_stats.clear()
+
+        with self.assertLogs('django_app', level='INFO') as logs:
+            response = self.client.get('/')
+
+        self.assertIsInstance(response, FileResponse)
+        log_data = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(log_data["response_status"], 200)
+        self.assertEqual(log_data["response_body_size"], self.entry['content_length'])
+        self.assertEqual([summary["route"] for summary in request_stats.recent()], ['/'])
+
+    @pytest.mark.timeout(30)
+    def test_home_served_from_file_behind_https_settings(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: PrerenderedPageMiddleware.process_view
+        """
+        with override_settings(SECURE_SSL_REDIRECT=True, SECURE_HSTS_SECONDS=3600):
+            response = self.client.get('/')
+            self.assertEqual(response.status_code, 301)
+            self.assertEqual(response['Location'], 'https://testserver/')
+
+            response = self.client.get('/', secure=True)
+            self.assertIsInstance(response, FileResponse)
+            self.assertEqual(response['Strict-Transport-Security'], 'max-age=3600')
+
+    @pytest.mark.timeout(30)
+    def test_home_falls_back_when_missing(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: home
+        """
+        os.remove(os.path.join(self.directory, 'home.html'))
+
+        response = self.client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'django_app/home.html')
+
+    @pytest.mark.timeout(30)
+    def test_home_falls_back_when_stale(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: home
+        """
+        # Pretend the template changed after prerendering
+        manifest_path = os.path.join(self.directory, 'manifest.json')
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        manifest['home']['template_mtime'] -= 60
+        with open(manifest_path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        response = self.client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'django_app/home.html')
+
+    @pytest.mark.timeout(30)
+    def test_home_post_renders_live(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: home
+        """
+        response = self.client.post('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'django_app/home.html')
+
+    @pytest.mark.timeout(60)
+    def test_prerendered_vs_live_throughput(self):
+        """
+        Test kind: performance_tests
+        Original method FQN: PrerenderedPageMiddleware.process_view
+        """
+        application = WSGIHandler()
+        environ = RequestFactory()._base_environ(PATH_INFO='/', REQUEST_METHOD='GET')
+
+        def requests_per_second(total=500):
+            # Call the WSGI application as a server providing wsgi.file_wrapper would
+            def request():
+                body = application(
+                    dict(environ, **{'wsgi.input': BytesIO(), 'wsgi.file_wrapper': FileWrapper}),
+                    lambda status, headers: None,
+                )
+                if isinstance(body, FileWrapper):
+                    content = body.filelike.read()
+                else:
+                    content = b''.join(body)
+                body.close()
+                return content
+
+            for _ in range(20):
+                content = request()
+            started = time.perf_counter()
+            for _ in range(total):
+                request()
+            return total / (time.perf_counter() - started), content
+
+        prerendered_rps, prerendered_body = requests_per_second()
+        with override_settings(PRERENDER_DIR=os.path.join(self.directory, 'missing')):
+            live_rps, live_body = requests_per_second()
+
+        print(f"\nHome page: prerendered {prerendered_rps:,.0f} req/s, live {live_rps:,.0f} req/s")
+        self.assertEqual(prerendered_body, live_body)
+        self.assertGreater(prerendered_rps, 100)
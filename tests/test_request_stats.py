@@ -0,0 +1,133 @@
+import pytest
+from django.test import TestCase, Client, override_settings
+
+from django_app.request_stats import RequestStats, request_stats
+
+
+def _summary(route, duration, url='http://testserver/'):
+    return {
+        'time': 1234567890.123,
+        'method': 'GET',
+        'url': url,
+        'route': route,
+        'status': 200,
+        'duration': duration,
+    }
+
+
+class TestRequestStats(TestCase):
+    """Test cases for RequestStats class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.stats = RequestStats(recent_size=3, top_k=2, window=60.0)
+
+    @pytest.mark.timeout(30)
+    def test_recent_is_bounded_ring_buffer(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: RequestStats.recent
+        """
+        for duration in range(5):
+            self.stats.record(_summary('/', duration), now=100.0)
+
+        # Only the newest entries are kept, newest first
+        self.assertEqual([summary['duration'] for summary in self.stats.recent()], [4, 3, 2])
+
+    @pytest.mark.timeout(30)
+    def test_slowest_keeps_top_k_per_route(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: RequestStats.slowest
+        """
+        for duration in [5.0, 50.0, 1.0, 30.0, 10.0]:
+            self.stats.record(_summary('/', duration), now=100.0)
+        self.stats.record(_summary('/status', 1000.0), now=100.0)
+
+        slowest = self.stats.slowest(now=100.0)
+
+        self.assertEqual(list(slowest), ['/', '/status'])
+        self.assertEqual([summary['duration'] for summary in slowest['/']], [50.0, 30.0])
+        self.assertEqual([summary['duration'] for summary in slowest['/status']], [1000.0])
+        # Each time bucket holds at most K entries per route
+        self.assertEqual(len(self.stats._buckets[-1][1]['/']), 2)
+
+    @pytest.mark.timeout(30)
+    def test_slowest_slides_window(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: RequestStats.slowest
+        """
+        self.stats.record(_summary('/', 900.0), now=100.0)
+        self.stats.record(_summary('/', 20.0), now=130.0)
+        self.stats.record(_summary('/', 10.0), now=150.0)
+
+        # Everything is inside the window
+        durations = [summary['duration'] for summary in self.stats.slowest(now=150.0)['/']]
+        self.assertEqual(durations, [900.0, 20.0])
+
+        # The oldest slow request has left the window
+        durations = [summary['duration'] for summary in self.stats.slowest(now=175.0)['/']]
+        self.assertEqual(durations, [20.0, 10.0])
+
+        # Old buckets are dropped, not accumulated
+        for second in range(200, 1000, 10):
+            self.stats.record(_summary('/', 1.0), now=float(second))
+        self.assertEqual(len(self.stats._buckets), RequestStats.BUCKETS)
+
+
+class TestDebugRequestsView(TestCase):
+    """Test cases for the debug requests view endpoint."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        request_stats.clear()
+
+    @pytest.mark.timeout(30)
+    def test_debug_requests_forbidden_without_token(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: debug_requests
+        """
+        with override_settings(DEBUG_ENDPOINT_TOKEN='secret'):
+            response = self.client.get('/debug/requests')
+            self.assertEqual(response.status_code, 403)
+
+            response = self.client.get('/debug/requests', headers={'X-Debug-Token': 'wrong'})
+            self.assertEqual(response.status_code, 403)
+
+    @pytest.mark.timeout(30)
+    def test_debug_requests_endpoint(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: debug_requests
+        """
+        self.client.get('/')
+
+        with override_settings(DEBUG_ENDPOINT_TOKEN='secret'):
+            response = self.client.get('/debug/requests', headers={'X-Debug-Token': 'secret'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'django_app/debug_requests.html')
+        self.assertContains(response, 'Request Debug')
+        self.assertContains(response, 'http://testserver/')
+
+    @pytest.mark.timeout(30)
+    def test_debug_requests_endpoint_json(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: debug_requests
+        """
+        self.client.get('/')
+        self.client.get('/missing')
+
+        with override_settings(DEBUG_ENDPOINT_TOKEN='secret'):
+            response = self.client.get('/debug/requests?format=json', headers={'X-Debug-Token': 'secret'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([summary['url'] for summary in data['recent']], ['http://testserver/missing', 'http://testserver/'])
+        self.assertEqual(set(data['slowest']), {'/', '<unmatched>'})
+        self.assertEqual(data['slowest']['<unmatched>'][0]['status'], 404)
+        self.assertIn('gc_pauses', data)
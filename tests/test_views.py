@@ -240,4 +240,32 @@ class TestStatusView(TestCase):
 
         # Verify successful response (query params should be ignored by the view)
         self.assertEqual(response.status_code, 200)
-        self.assertContains(response, 'System Status')
\ No newline at end of file
+        self.assertContains(response, 'System Status')
+
+class TestStatusJsonView(TestCase):
+    """Test cases for the status JSON view endpoint."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+
+    @pytest.mark.timeout(30)
+    def test_status_json_endpoint(self):
+        """
+        Test kind: endpoint_tests
+        Original method FQN: status_json
+        """
+        # Make GET request to status JSON endpoint
+        response = self.client.get('/status.json')
+
+        # Verify successful JSON response
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        # Verify the same data as the status page is returned
+        data = response.json()
+        self.assertEqual(
+            set(data),
+            {'os_name', 'os_version', 'current_datetime', 'cpu_usage', 'memory_usage'},
+        )
+        self.assertIsInstance(data['cpu_usage'], float)
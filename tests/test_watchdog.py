@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+import pytest
+from django.http import HttpRequest
+from django.test import TestCase
+
+from django_app.watchdog import SlowRequestWatchdog
+
+
+def _blocking_view(started, release):
+    """Stand-in for a view that stalls until released."""
+    started.set()
+    release.wait(10)
+
+
+class TestSlowRequestWatchdog(TestCase):
+    """Test cases for SlowRequestWatchdog class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.watchdog = SlowRequestWatchdog(threshold=1.0, interval=60)
+        self.watchdog.start()
+        self.request = Mock(spec=HttpRequest)
+        self.request.method = 'GET'
+        self.request.build_absolute_uri.return_value = 'http://testserver/status'
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def tearDown(self):
+        """Release the worker thread and stop the watchdog."""
+        self.release.set()
+        self.watchdog.stop()
+
+    def _start_worker(self):
+        def worker():
+            self.watchdog.request_started(self.request)
+            _blocking_view(self.started, self.release)
+            self.watchdog.request_finished(self.request)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        self.started.wait(10)
+        return thread
+
+    @pytest.mark.timeout(30)
+    @patch('django_app.watchdog.logging.getLogger')
+    def test_check_captures_slow_request_once(self, mock_get_logger):
+        """
+        Test kind: unit_tests
+        Original method FQN: SlowRequestWatchdog.check
+        """
+        mock_logger = Mock()
+        mock_get_logger.return_value = mock_logger
+        thread = self._start_worker()
+        entry = self.watchdog._in_flight[thread.ident]
+
+        # Below the threshold nothing is captured
+        self.assertEqual(self.watchdog.check(now=entry.start + 0.5), [])
+
+        # Over the threshold the worker's live stack is dumped
+        records = self.watchdog.check(now=entry.start + 1.5)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['method'], 'GET')
+        self.assertEqual(records[0]['url'], 'http://testserver/status')
+        self.assertEqual(records[0]['elapsed'], 1500.0)
+        self.assertIn('_blocking_view', records[0]['stack'])
+        mock_get_logger.assert_called_once_with('django_app.slow_requests')
+        mock_logger.warning.assert_called_once()
+
+        # The same request is never captured twice
+        self.assertEqual(self.watchdog.check(now=entry.start + 5.0), [])
+        mock_logger.warning.assert_called_once()
+
+    @pytest.mark.timeout(30)
+    def test_request_finished_unregisters(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SlowRequestWatchdog.request_finished
+        """
+        thread = self._start_worker()
+        self.assertIn(thread.ident, self.watchdog._in_flight)
+
+        self.release.set()
+        thread.join(10)
+
+        self.assertNotIn(thread.ident, self.watchdog._in_flight)
+        self.assertEqual(self.watchdog.check(), [])
+
+    @pytest.mark.timeout(30)
+    def test_request_started_ignored_when_stopped(self):
+        """
+        Test kind: unit_tests
+        Original method FQN: SlowRequestWatchdog.request_started
+        """
+        self.watchdog.stop()
+
+        self.watchdog.request_started(self.request)
+
+        self.assertEqual(self.watchdog._in_flight, {})
+
+    @pytest.mark.timeout(30)
+    @skipUnless(hasattr(os, 'fork'), "requires os.fork")
+    @patch('django_app.watchdog.logging.getLogger')
+    def test_forked_child_starts_own_thread(self, mock_get_logger):
+        """
+        Test kind: unit_tests
+        Original method FQN: SlowRequestWatchdog.request_started
+        """
+        self.watchdog.configure(threshold=0.05, interval=0.02)
+        self.watchdog.stop()
+        self.watchdog.start()
+
+        pid = os.fork()
+        if pid == 0:
+            captured = False
+            try:
+                # The parent's watchdog thread did not survive the fork
+                self.watchdog.request_started(self.request)
+                deadline = time.monotonic() + 5
+                while not captured and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                    captured = self.watchdog._in_flight[threading.get_ident()].captured
+            finally:
+                os._exit(0 if captured else 1)
+        _, status = os.waitpid(pid, 0)
+
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)